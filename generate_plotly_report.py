@@ -1,20 +1,91 @@
+from functools import partial
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs_version
 from plotly.subplots import make_subplots
 import yaml
 
-def create_interactive_report(df: pd.DataFrame, output_file: str = "transaction_monitoring_analysis.html") -> None:
-    """Generate simple interactive plotly report for transaction monitoring analysis."""
-    
-    if 'alert_outcome' not in df.columns:
-        print("Cannot create report: Missing 'alert_outcome' column")
-        return
-    
-    # Calculate FPR data
-    total_alerts = len(df)
-    false_positives = (df['alert_outcome'] == 'false_positive').sum()
-    true_positives = (df['alert_outcome'] == 'true_positive').sum()
-    overall_fpr = false_positives / total_alerts
+from helper.function import encode_categoricals, load_data, map_dimensions, prepare_outcome_masks
+
+# The report only uses pie, bar, box and heatmap traces, all in the smaller cartesian bundle.
+# Pinning it to the plotly.js version bundled with plotly.py keeps the JSON schema in sync.
+PLOTLYJS_URL = f"https://cdn.plot.ly/plotly-cartesian-{get_plotlyjs_version()}.min.js"
+
+# Above this many cells the heatmap drops its per-cell text labels (one SVG text node each);
+# values remain available on hover
+HEATMAP_LABEL_MAX_CELLS = 2500
+
+# Columns read by the report sections; the standalone entry point loads only these
+REPORT_COLUMNS = ['alert_outcome', 'alert_type', 'customer_risk_tier', 'country',
+                  'alert_amount_usd', 'time_to_disposition_days']
+
+# Box plots ship precomputed quartiles; only this many outlier points are embedded per box
+MAX_BOX_OUTLIERS = 200
+
+def _box_summary(values: np.ndarray, max_outliers: int = MAX_BOX_OUTLIERS) -> dict | None:
+    """Summarise a sample into the precomputed-statistics form accepted by go.Box.
+    
+    Args:
+        values: The raw sample for a single box
+        max_outliers: Maximum number of outlier points to keep
+    
+    Returns:
+        Keyword arguments for go.Box, or None if the sample has no valid values
+    """
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return None
+    
+    # plotly.js's default quartilemethod='linear' is Hazen interpolation, not numpy's default
+    q1, median, q3 = np.percentile(values, [25, 50, 75], method='hazen')
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    outliers = values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)]
+    if outliers.size > max_outliers:
+        # Keep an evenly spaced subset of the sorted outliers so the extremes survive
+        outliers = np.sort(outliers)[np.linspace(0, outliers.size - 1, max_outliers).astype(int)]
+    
+    return dict(
+        q1=[q1], median=[median], q3=[q3],
+        lowerfence=[inside.min()], upperfence=[inside.max()],
+        mean=[values.mean()],
+        y=[outliers],
+        boxpoints='outliers'
+    )
+
+def _percent_labels(values) -> np.ndarray:
+    """Format fractions as '12.3%' labels in one numpy call (any array shape)."""
+    return np.char.mod('%.1f%%', np.asarray(values, dtype=float) * 100)
+
+def _rate_by(mask: pd.Series, keys: pd.Series) -> pd.Series:
+    """Mean of an int8 outcome mask per group, highest rate first.
+    
+    Categorical keys are aggregated with np.bincount over their integer codes,
+    which avoids building a hash table per call; other dtypes use a groupby.
+    """
+    if not isinstance(keys.dtype, pd.CategoricalDtype):
+        return mask.groupby(keys, observed=True, sort=False).mean().sort_values(ascending=False)
+    
+    codes = keys.cat.codes.to_numpy()
+    valid = codes >= 0
+    n_categories = len(keys.cat.categories)
+    totals = np.bincount(codes[valid], minlength=n_categories)
+    hits = np.bincount(codes[valid], weights=mask.to_numpy()[valid], minlength=n_categories)
+    
+    # Keep only observed categories, matching groupby(observed=True)
+    observed = totals > 0
+    rates = pd.Series(hits[observed] / totals[observed],
+                      index=pd.Index(keys.cat.categories[observed], name=keys.name))
+    return rates.sort_values(ascending=False)
+
+def _build_fpr_section(df: pd.DataFrame, is_fp: pd.Series, is_tp: pd.Series,
+                       tables: dict[str, pd.DataFrame] | None) -> go.Figure:
+    """Section 1: alert distribution and FPR by alert type, risk tier and country."""
+    false_positives = np.count_nonzero(is_fp)
+    true_positives = np.count_nonzero(is_tp)
+    overall_fpr = false_positives / len(df)
     
     # Create subplots
     fig = make_subplots(
@@ -35,19 +106,24 @@ def create_interactive_report(df: pd.DataFrame, output_file: str = "transaction_
         row=1, col=1
     )
     
+    # Reuse the per-dimension FPR tables when the caller already has them,
+    # otherwise compute every dimension in one concurrent batch
+    if tables is not None:
+        fpr_by = {col: table['fpr'].sort_values(ascending=False) for col, table in tables.items()}
+    else:
+        fpr_by = map_dimensions(partial(_rate_by, is_fp), df, ('alert_type', 'customer_risk_tier', 'country'))
+    
     # 2. FPR by Alert Type
-    if 'alert_type' in df.columns:
-        fpr_by_type = df.groupby('alert_type')['alert_outcome'].apply(
-            lambda x: (x == 'false_positive').sum() / len(x) if len(x) > 0 else 0
-        ).sort_values(ascending=False)
+    if 'alert_type' in fpr_by:
+        fpr_by_type = fpr_by['alert_type']
         
         fig.add_trace(
             go.Bar(
-                x=list(fpr_by_type.index),
-                y=list(fpr_by_type.values),
+                x=fpr_by_type.index.to_numpy(),
+                y=fpr_by_type.to_numpy(),
                 marker_color='lightblue',
                 name='FPR by Alert Type',
-                text=[f"{val:.1%}" for val in fpr_by_type.values],
+                text=_percent_labels(fpr_by_type.values),
                 textposition='outside',
                 showlegend=False
             ),
@@ -55,18 +131,16 @@ def create_interactive_report(df: pd.DataFrame, output_file: str = "transaction_
         )
     
     # 3. FPR by Customer Risk Tier
-    if 'customer_risk_tier' in df.columns:
-        fpr_by_risk = df.groupby('customer_risk_tier')['alert_outcome'].apply(
-            lambda x: (x == 'false_positive').sum() / len(x) if len(x) > 0 else 0
-        ).sort_values(ascending=False)
+    if 'customer_risk_tier' in fpr_by:
+        fpr_by_risk = fpr_by['customer_risk_tier']
         
         fig.add_trace(
             go.Bar(
-                x=list(fpr_by_risk.index),
-                y=list(fpr_by_risk.values),
+                x=fpr_by_risk.index.to_numpy(),
+                y=fpr_by_risk.to_numpy(),
                 marker_color='lightgreen',
                 name='FPR by Risk Tier',
-                text=[f"{val:.1%}" for val in fpr_by_risk.values],
+                text=_percent_labels(fpr_by_risk.values),
                 textposition='outside',
                 showlegend=False
             ),
@@ -74,18 +148,16 @@ def create_interactive_report(df: pd.DataFrame, output_file: str = "transaction_
         )
     
     # 4. FPR by Country (Top 10)
-    if 'country' in df.columns:
-        fpr_by_country = df.groupby('country')['alert_outcome'].apply(
-            lambda x: (x == 'false_positive').sum() / len(x) if len(x) > 0 else 0
-        ).sort_values(ascending=False).head(10)
+    if 'country' in fpr_by:
+        fpr_by_country = fpr_by['country'].head(10)
         
         fig.add_trace(
             go.Bar(
-                x=list(fpr_by_country.index),
-                y=list(fpr_by_country.values),
+                x=fpr_by_country.index.to_numpy(),
+                y=fpr_by_country.to_numpy(),
                 marker_color='gold',
                 name='FPR by Country',
-                text=[f"{val:.1%}" for val in fpr_by_country.values],
+                text=_percent_labels(fpr_by_country.values),
                 textposition='outside',
                 showlegend=False
             ),
@@ -110,78 +182,86 @@ def create_interactive_report(df: pd.DataFrame, output_file: str = "transaction_
     fig.update_yaxes(range=[0, 1], row=2, col=1)
     fig.update_yaxes(range=[0, 1], row=2, col=2)
     
-    # Section 2: Time to Disposition Analysis (Combined Bar + Box Plot)
-    fig2 = make_subplots(
+    return fig
+
+def _build_time_section(df: pd.DataFrame, is_fp: pd.Series, is_tp: pd.Series,
+                        tables: dict[str, pd.DataFrame] | None) -> go.Figure:
+    """Section 2: average and distribution of time to disposition by alert type."""
+    fig = make_subplots(
         rows=1, cols=2,
         subplot_titles=('Average Time by Alert Type', 'Time Distribution by Alert Type')
     )
     
     if 'time_to_disposition_days' in df.columns and 'alert_type' in df.columns:
         # Bar chart - average time
-        avg_time_by_type = df.groupby('alert_type')['time_to_disposition_days'].mean().sort_values(ascending=False)
-        fig2.add_trace(
+        time_by_type = df.groupby('alert_type', observed=True, sort=False)['time_to_disposition_days']
+        avg_time_by_type = time_by_type.mean().sort_values(ascending=False)
+        fig.add_trace(
             go.Bar(
-                x=list(avg_time_by_type.index),
-                y=list(avg_time_by_type.values),
+                x=avg_time_by_type.index.to_numpy(),
+                y=avg_time_by_type.to_numpy(),
                 marker_color='lightcoral',
-                text=[f"{val:.1f}" for val in avg_time_by_type.values],
+                text=np.char.mod('%.1f', avg_time_by_type.to_numpy()),
                 textposition='outside'
             ),
             row=1, col=1
         )
         
-        # Box plot - distribution
+        # Box plot - distribution (row positions come from the same groupby, no per-type filtering)
+        times = df['time_to_disposition_days'].to_numpy(dtype=float)
+        rows_by_type = time_by_type.indices
         for alert_type in avg_time_by_type.index:
-            type_data = df[df['alert_type'] == alert_type]['time_to_disposition_days'].tolist()
-            fig2.add_trace(
+            box_stats = _box_summary(times[rows_by_type[alert_type]])
+            if box_stats is None:
+                continue
+            fig.add_trace(
                 go.Box(
-                    y=type_data,
+                    x=[str(alert_type)],
                     name=str(alert_type),
-                    boxmean=True
+                    boxmean=True,
+                    **box_stats
                 ),
                 row=1, col=2
             )
     
-    fig2.update_layout(
+    fig.update_layout(
         title="Time to Disposition Analysis by Alert Type",
         title_x=0.5,
         height=450,
         showlegend=False
     )
-    fig2.update_xaxes(title_text="Alert Type", row=1, col=1)
-    fig2.update_xaxes(title_text="Alert Type", row=1, col=2)
-    fig2.update_yaxes(title_text="Average Days", row=1, col=1)
-    fig2.update_yaxes(title_text="Days", row=1, col=2)
+    fig.update_xaxes(title_text="Alert Type", row=1, col=1)
+    fig.update_xaxes(title_text="Alert Type", row=1, col=2)
+    fig.update_yaxes(title_text="Average Days", row=1, col=1)
+    fig.update_yaxes(title_text="Days", row=1, col=2)
     
-    # Section 3: Alert Amount vs True Positive Rate
-    fig3 = go.Figure()
+    return fig
+
+def _build_amount_section(df: pd.DataFrame, is_fp: pd.Series, is_tp: pd.Series,
+                          tables: dict[str, pd.DataFrame] | None) -> go.Figure:
+    """Section 3: true positive rate by alert amount range."""
+    fig = go.Figure()
     
     if 'alert_amount_usd' in df.columns and 'alert_outcome' in df.columns:
         # Create amount bins
         bins = [0, 1000, 5000, 10000, 20000, float('inf')]
         labels = ['$0-1K', '$1K-5K', '$5K-10K', '$10K-20K', '$20K+']
-        df['amount_bin'] = pd.cut(df['alert_amount_usd'], bins=bins, labels=labels)
+        amount_bin = pd.cut(df['alert_amount_usd'], bins=bins, labels=labels).rename('amount_bin')
         
-        # Calculate TPR for each bin
-        tpr_by_amount = df.groupby('amount_bin', observed=True).agg(
-            tpr=('alert_outcome', lambda x: (x == 'true_positive').sum() / len(x)),
-            count=('alert_outcome', 'size')
-        ).reset_index()
+        # Calculate TPR for each bin (grouping the mask directly, df is left untouched)
+        tpr_by_amount = is_tp.groupby(amount_bin, observed=True).agg(tpr='mean', count='size').reset_index()
         
-        fig3.add_trace(
+        fig.add_trace(
             go.Bar(
-                x=list(tpr_by_amount['amount_bin']),
-                y=list(tpr_by_amount['tpr']),
+                x=tpr_by_amount['amount_bin'].to_numpy(),
+                y=tpr_by_amount['tpr'].to_numpy(),
                 marker_color='steelblue',
-                text=[f"{val:.1%}<br>(n={cnt})" for val, cnt in zip(tpr_by_amount['tpr'], tpr_by_amount['count'])],
+                text=np.char.add(_percent_labels(tpr_by_amount['tpr']), np.char.mod('<br>(n=%d)', tpr_by_amount['count'].to_numpy())),
                 textposition='outside'
             )
         )
-        
-        # Clean up temp column
-        df.drop('amount_bin', axis=1, inplace=True)
     
-    fig3.update_layout(
+    fig.update_layout(
         title="True Positive Rate by Alert Amount",
         title_x=0.5,
         height=400,
@@ -192,43 +272,50 @@ def create_interactive_report(df: pd.DataFrame, output_file: str = "transaction_
         showlegend=False
     )
     
-    # Section 4: TPR Heatmap by Country and Customer Risk Tier
-    fig4 = go.Figure()
+    return fig
+
+def _build_heatmap_section(df: pd.DataFrame, is_fp: pd.Series, is_tp: pd.Series,
+                           tables: dict[str, pd.DataFrame] | None) -> go.Figure:
+    """Section 4: true positive rate heatmap by country and customer risk tier."""
+    fig = go.Figure()
     
     if 'country' in df.columns and 'customer_risk_tier' in df.columns and 'alert_outcome' in df.columns:
-        # Create pivot table for TPR
-        df['is_tp'] = (df['alert_outcome'] == 'true_positive').astype(int)
-        pivot = df.pivot_table(values='is_tp', index='country', columns='customer_risk_tier', aggfunc='mean')
-        count_pivot = df.pivot_table(values='is_tp', index='country', columns='customer_risk_tier', aggfunc='count')
+        # One grouped pass yields both the rate and the alert count per cell
+        tpr_by_cell = is_tp.groupby([df['country'], df['customer_risk_tier']], observed=True, sort=False).agg(['mean', 'size'])
+        pivot = tpr_by_cell['mean'].unstack('customer_risk_tier').sort_index().sort_index(axis=1)
+        count_pivot = tpr_by_cell['size'].unstack('customer_risk_tier', fill_value=0).reindex_like(pivot)
         
-        # Build hover text
-        hover_text = []
-        for i, country in enumerate(pivot.index):
-            row = []
-            for j, tier in enumerate(pivot.columns):
-                tpr = pivot.iloc[i, j]
-                cnt = count_pivot.iloc[i, j]
-                row.append(f"Country: {country}<br>Risk Tier: {tier}<br>True Positive Rate: {tpr:.1%}<br>Total Alerts: {int(cnt)}")
-            hover_text.append(row)
+        # Build hover text with broadcast numpy string ops rather than a per-cell loop
+        hover_text = np.char.add(np.char.add('Country: ', pivot.index.to_numpy(dtype=str)[:, None]),
+                                 np.char.add('<br>Risk Tier: ', pivot.columns.to_numpy(dtype=str)[None, :]))
+        hover_text = np.char.add(hover_text, np.char.add('<br>True Positive Rate: ', _percent_labels(pivot.to_numpy())))
+        hover_text = np.char.add(hover_text, np.char.mod('<br>Total Alerts: %d', count_pivot.to_numpy()))
         
-        fig4.add_trace(
+        # Cell labels only for grids small enough to stay responsive
+        if pivot.size < HEATMAP_LABEL_MAX_CELLS:
+            cell_labels = dict(
+                text=_percent_labels(pivot.values),
+                texttemplate="%{text}",
+                textfont={"size": 12}
+            )
+        else:
+            cell_labels = {}
+        
+        fig.add_trace(
             go.Heatmap(
-                z=pivot.values.tolist(),
-                x=pivot.columns.tolist(),
-                y=pivot.index.tolist(),
+                z=pivot.to_numpy(),
+                x=pivot.columns.to_numpy(),
+                y=pivot.index.to_numpy(),
                 colorscale='RdYlGn',
-                text=[[f"{val:.1%}" for val in row] for row in pivot.values],
-                texttemplate="%{text}",
-                textfont={"size": 12},
+                **cell_labels,
                 hovertext=hover_text,
                 hovertemplate="%{hovertext}<extra></extra>",
                 colorbar_title="TPR",
                 colorbar_tickformat=".0%"
             )
         )
-        df.drop('is_tp', axis=1, inplace=True)
     
-    fig4.update_layout(
+    fig.update_layout(
         title="True Positive Rate by Country and Risk Tier",
         title_x=0.5,
         height=450,
@@ -236,58 +323,66 @@ def create_interactive_report(df: pd.DataFrame, output_file: str = "transaction_
         yaxis_title="Country"
     )
     
-    # Section 5: Precision by Segment (TP / (TP + FP))
-    fig5 = make_subplots(
+    return fig
+
+def _build_precision_section(df: pd.DataFrame, is_fp: pd.Series, is_tp: pd.Series,
+                             tables: dict[str, pd.DataFrame] | None) -> go.Figure:
+    """Section 5: precision by alert type, risk tier and country."""
+    fig = make_subplots(
         rows=1, cols=3,
         subplot_titles=('By Alert Type', 'By Risk Tier', 'By Country')
     )
     
     if 'alert_outcome' in df.columns:
-        # Precision by Alert Type
-        precision_by_type = df.groupby('alert_type', observed=True).apply(
-            lambda x: (x['alert_outcome'] == 'true_positive').sum() / len(x), include_groups=False
-        ).sort_values(ascending=False)
-        fig5.add_trace(
-            go.Bar(x=list(precision_by_type.index), y=list(precision_by_type.values),
-                   marker_color='mediumseagreen', text=[f"{v:.1%}" for v in precision_by_type.values], textposition='outside'),
-            row=1, col=1
-        )
+        # Precision is the TP rate per segment; all three come from one concurrent batch
+        precision_by = map_dimensions(partial(_rate_by, is_tp), df, ('alert_type', 'customer_risk_tier', 'country'))
         
-        # Precision by Risk Tier
-        precision_by_tier = df.groupby('customer_risk_tier', observed=True).apply(
-            lambda x: (x['alert_outcome'] == 'true_positive').sum() / len(x), include_groups=False
-        ).sort_values(ascending=False)
-        fig5.add_trace(
-            go.Bar(x=list(precision_by_tier.index), y=list(precision_by_tier.values),
-                   marker_color='mediumseagreen', text=[f"{v:.1%}" for v in precision_by_tier.values], textposition='outside'),
-            row=1, col=2
-        )
-        
-        # Precision by Country (top 10)
-        precision_by_country = df.groupby('country', observed=True).apply(
-            lambda x: (x['alert_outcome'] == 'true_positive').sum() / len(x), include_groups=False
-        ).sort_values(ascending=False).head(10)
-        fig5.add_trace(
-            go.Bar(x=list(precision_by_country.index), y=list(precision_by_country.values),
-                   marker_color='mediumseagreen', text=[f"{v:.1%}" for v in precision_by_country.values], textposition='outside'),
-            row=1, col=3
-        )
+        # Precision by Alert Type, by Risk Tier and by Country (top 10)
+        for position, col in enumerate(('alert_type', 'customer_risk_tier', 'country'), start=1):
+            if col not in precision_by:
+                continue
+            precision = precision_by[col].head(10) if col == 'country' else precision_by[col]
+            fig.add_trace(
+                go.Bar(x=precision.index.to_numpy(), y=precision.to_numpy(),
+                       marker_color='mediumseagreen', text=_percent_labels(precision.values), textposition='outside'),
+                row=1, col=position
+            )
     
-    fig5.update_layout(
+    fig.update_layout(
         title="Precision by Segment (TP / Total Alerts)",
         title_x=0.5,
         height=400,
         showlegend=False
     )
-    fig5.update_yaxes(tickformat='.0%', range=[0, 0.5])
+    fig.update_yaxes(tickformat='.0%', range=[0, 0.5])
     
-    # Create HTML content
-    html_content = f"""
+    return fig
+
+def _embed(fig: go.Figure, div_id: str) -> str:
+    """Serialise a figure once and return a div plus a Plotly.newPlot call for it."""
+    # Escape '</' so no string inside the JSON can close the script tag early
+    payload = fig.to_json(validate=False).replace("</", "<\\/")
+    return (f'<div id="{div_id}"></div>'
+            f'<script>var f={payload};Plotly.newPlot("{div_id}",f.data,f.layout,{{responsive:true}});</script>')
+
+# Report sections in display order: key -> (heading, subtitle, builder)
+REPORT_SECTIONS = {
+    'fpr': ("False Positive Rate Analysis by Different Dimensions", None, _build_fpr_section),
+    'time': ("Time to Disposition Analysis", None, _build_time_section),
+    'amount': ("Alert Amount vs True Positive Rate",
+               "Does the model effectively detect higher-risk large value alerts?", _build_amount_section),
+    'heatmap': ("True Positive Rate by Country and Risk Tier",
+                "Are there countries or risk tiers with unusually high or low true positive rates?", _build_heatmap_section),
+    'precision': ("Precision by Segment",
+                  "Precision = TP / (TP + FP). Higher precision means fewer false alarms in that segment.", _build_precision_section),
+}
+
+HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
     <title>Transaction Monitoring Model Analysis</title>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    <script src="{plotlyjs_url}"></script>
     <style>
         body {{ font-family: Arial, sans-serif; margin: 20px; }}
         .header {{ text-align: center; margin-bottom: 20px; }}
@@ -300,7 +395,7 @@ def create_interactive_report(df: pd.DataFrame, output_file: str = "transaction_
 <body>
     <div class="header">
         <h1>Transaction Monitoring Model Analysis</h1>
-        <p>Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+        <p>Generated: {generated}</p>
     </div>
     
     <div class="metrics">
@@ -321,41 +416,79 @@ def create_interactive_report(df: pd.DataFrame, output_file: str = "transaction_
             <div>Total Alerts</div>
         </div>
     </div>
-    
+    {sections}
+</body>
+</html>
+"""
+
+SECTION_TEMPLATE = """
     <div class="section">
-        <h2>Section 1: False Positive Rate Analysis by Different Dimensions</h2>
-        <div id="charts">{fig.to_html(full_html=False, include_plotlyjs=False)}</div>
+        <h2>Section {number}: {heading}</h2>{subtitle}
+        <div id="charts{number}">{chart}</div>
     </div>
+"""
+
+SUBTITLE_TEMPLATE = """
+        <p style="color: #666; margin-bottom: 10px;">{text}</p>"""
+
+def create_interactive_report(df: pd.DataFrame, output_file: str = "transaction_monitoring_analysis.html",
+                              masks: tuple[np.ndarray, np.ndarray] | None = None,
+                              sections: tuple[str, ...] = tuple(REPORT_SECTIONS),
+                              tables: dict[str, pd.DataFrame] | None = None) -> None:
+    """Generate simple interactive plotly report for transaction monitoring analysis.
+    
+    Args:
+        df: The pandas DataFrame to analyze
+        output_file: The filename to save the HTML report to
+        masks: Optional (is_fp, is_tp) tuple from prepare_outcome_masks
+        sections: Keys of REPORT_SECTIONS to include, in display order
+        tables: Optional per-dimension tables from compute_fpr_tables, reused by the FPR section
+    """
     
-    <div class="section">
-        <h2>Section 2: Time to Disposition Analysis</h2>
-        <div id="charts2">{fig2.to_html(full_html=False, include_plotlyjs=False)}</div>
-    </div>
+    if 'alert_outcome' not in df.columns:
+        print("Cannot create report: Missing 'alert_outcome' column")
+        return
     
-    <div class="section">
-        <h2>Section 3: Alert Amount vs True Positive Rate</h2>
-        <p style="color: #666; margin-bottom: 10px;">Does the model effectively detect higher-risk large value alerts?</p>
-        <div id="charts3">{fig3.to_html(full_html=False, include_plotlyjs=False)}</div>
-    </div>
+    df = encode_categoricals(df)
     
-    <div class="section">
-        <h2>Section 4: True Positive Rate by Country and Risk Tier</h2>
-        <p style="color: #666; margin-bottom: 10px;">Are there countries or risk tiers with unusually high or low true positive rates?</p>
-        <div id="charts4">{fig4.to_html(full_html=False, include_plotlyjs=False)}</div>
-    </div>
+    # Outcome masks computed once and reused by every FPR aggregation below
+    fp_mask, tp_mask = masks if masks is not None else prepare_outcome_masks(df)
+    is_fp = pd.Series(fp_mask, index=df.index)
+    is_tp = pd.Series(tp_mask, index=df.index)
     
-    <div class="section">
-        <h2>Section 5: Precision by Segment</h2>
-        <p style="color: #666; margin-bottom: 10px;">Precision = TP / (TP + FP). Higher precision means fewer false alarms in that segment.</p>
-        <div id="charts5">{fig5.to_html(full_html=False, include_plotlyjs=False)}</div>
-    </div>
-</body>
-</html>
-"""
+    # Calculate FPR data
+    total_alerts = len(df)
+    false_positives = np.count_nonzero(fp_mask)
+    true_positives = np.count_nonzero(tp_mask)
+    overall_fpr = false_positives / total_alerts
+    
+    # Build and serialise each requested section
+    section_html = []
+    for number, key in enumerate(sections, start=1):
+        heading, subtitle, build = REPORT_SECTIONS[key]
+        fig = build(df, is_fp, is_tp, tables)
+        section_html.append(SECTION_TEMPLATE.format(
+            number=number,
+            heading=heading,
+            subtitle=SUBTITLE_TEMPLATE.format(text=subtitle) if subtitle else "",
+            chart=_embed(fig, f"chart{number}")
+        ))
+    
+    # Create HTML content
+    html_content = HTML_TEMPLATE.format(
+        plotlyjs_url=PLOTLYJS_URL,
+        generated=pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S'),
+        overall_fpr=overall_fpr,
+        false_positives=false_positives,
+        true_positives=true_positives,
+        total_alerts=total_alerts,
+        sections="".join(section_html)
+    )
     
-    # Save HTML file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    # Save HTML file: encode once and write in a single large buffered call
+    html_bytes = html_content.encode('utf-8')
+    with open(output_file, 'wb', buffering=1 << 20) as f:
+        f.write(html_bytes)
     
     print(f"📊 Interactive report saved as: {output_file}")
 
@@ -364,5 +497,5 @@ if __name__ == "__main__":
     with open("config.yaml", 'r') as file:
         config = yaml.safe_load(file)
     
-    df = pd.read_csv(config["INPUT_DATA_PATH"])
+    df = load_data(config["INPUT_DATA_PATH"], columns=REPORT_COLUMNS)
     create_interactive_report(df)
\ No newline at end of file
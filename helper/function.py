@@ -1,35 +1,310 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import os
+from pathlib import Path
+import tempfile
+from typing import Any, Callable
+
 import pandas as pd
 import numpy as np
-from ydata_profiling import ProfileReport
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Low-cardinality text columns that are grouped on throughout the reports
+CATEGORICAL_COLUMNS = ('alert_outcome', 'alert_type', 'country', 'customer_risk_tier')
+
+# Dimensions broken down in the FPR reports
+FPR_DIMENSIONS = ('alert_type', 'customer_risk_tier', 'country')
+
+# Profiling cost grows quickly with row count; larger frames are skipped
+EDA_MAX_ROWS = 1_000_000
+
+# Parquet schema metadata key recording which CSV engine produced a load_data cache file
+CACHE_ENGINE_KEY = b'load_data.engine'
 
-def load_data(file_path: str) -> pd.DataFrame:
-    """Load data from a CSV file into a pandas DataFrame."""
-    return pd.read_csv(file_path)
+def _read_parquet_cache(parquet_path: Path, csv_path: Path, engine: str,
+                        columns: list[str] | None) -> pd.DataFrame | None:
+    """Return the cached parse of csv_path, or None if it is stale, from another engine or unreadable."""
+    if not parquet_path.exists() or parquet_path.stat().st_mtime < csv_path.stat().st_mtime:
+        return None
+    try:
+        schema = pq.read_schema(parquet_path)
+        if (schema.metadata or {}).get(CACHE_ENGINE_KEY) != engine.encode():
+            return None
+        if columns is not None:
+            columns = [col for col in columns if col in schema.names]
+        return pd.read_parquet(parquet_path, columns=columns)
+    except (OSError, ValueError) as e:
+        # pyarrow reports truncated or corrupt files as ArrowInvalid, a ValueError
+        print(f"⚠️ Ignoring unreadable Parquet cache {parquet_path}: {e}")
+        return None
+
+def _write_parquet_cache(df: pd.DataFrame, parquet_path: Path, engine: str) -> None:
+    """Write df to parquet_path atomically, tagged with the CSV engine that parsed it.
+    
+    The cache is best-effort: any failure is reported and otherwise ignored.
+    """
+    try:
+        # Mixed-type object columns (e.g. from the C parser's chunked type inference) cannot be converted
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), CACHE_ENGINE_KEY: engine.encode()})
+        
+        # Write to a temporary file and rename it over the cache, so an interrupted
+        # write never leaves a truncated file that looks newer than the CSV
+        fd, tmp_path = tempfile.mkstemp(dir=parquet_path.parent, prefix=f".{parquet_path.stem}.",
+                                        suffix='.parquet.tmp')
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path, compression='zstd')
+            os.replace(tmp_path, parquet_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    except (OSError, TypeError, ValueError, pa.ArrowException) as e:
+        print(f"⚠️ Could not write Parquet cache {parquet_path}: {e}")
 
-def generate_eda_report(df: pd.DataFrame, title: str = "Data Report", output_file: str = "data_report.html") -> None:
+def load_data(file_path: str, columns: list[str] | None = None, dtypes: dict | None = None,
+              engine: str = "pyarrow", categorical_cols: tuple[str, ...] = CATEGORICAL_COLUMNS,
+              cache: bool = True) -> pd.DataFrame:
+    """Load data from a CSV file into a pandas DataFrame.
+    
+    When caching is enabled the plain parse of the CSV (every column, no dtype hints) is
+    stored as a Parquet file next to it and reused for as long as it is at least as new
+    as the CSV and was produced by the same engine. dtypes and categorical_cols are
+    applied after loading, so they never leak from one call into the next.
+    
+    Args:
+        file_path: Path to the CSV file
+        columns: Optional subset of columns to parse (those absent from the file are skipped); None loads every column
+        dtypes: Optional column -> dtype mapping passed to read_csv
+        engine: CSV parser engine; the default pyarrow engine parses with multiple threads
+        categorical_cols: Columns decoded straight to 'category' (ignored if absent from the file)
+        cache: Read from / write to the '.parquet' sibling of file_path
+    """
+    # Dictionary-encode the grouping columns at parse time; explicit dtypes take precedence
+    dtypes = {**{col: 'category' for col in categorical_cols}, **(dtypes or {})}
+    if not cache:
+        if columns is not None:
+            # Optional columns may be absent; the pyarrow engine rejects callable usecols, so check the header
+            header = pd.read_csv(file_path, nrows=0).columns
+            columns = [col for col in columns if col in header]
+        return pd.read_csv(file_path, engine=engine, usecols=columns, dtype=dtypes)
+
+    csv_path = Path(file_path)
+    parquet_path = csv_path.with_suffix('.parquet')
+    df = _read_parquet_cache(parquet_path, csv_path, engine, columns)
+    if df is None:
+        # The cache holds every column so later calls can read any subset from it
+        df = pd.read_csv(file_path, engine=engine)
+        _write_parquet_cache(df, parquet_path, engine)
+        if columns is not None:
+            df = df[[col for col in columns if col in df.columns]]
+    return df.astype({col: dtype for col, dtype in dtypes.items() if col in df.columns})
+
+def generate_eda_report(df: pd.DataFrame, title: str = "Data Report", output_file: str = "data_report.html",
+                        minimal: bool = True, explorative: bool = False, max_rows: int | None = EDA_MAX_ROWS) -> None:
     """Generate an EDA report using ydata-profiling.
     
     Args:
         df: The pandas DataFrame to analyze
         title: The title for the report
         output_file: The filename to save the report to
+        minimal: Use ydata-profiling's minimal mode, which skips correlations and interactions
+        explorative: Use the explorative mode instead (set minimal=False with it)
+        max_rows: Skip profiling entirely above this many rows; None disables the check
     """
-    profile = ProfileReport(df, title=title)
+    if max_rows is not None and len(df) > max_rows:
+        print(f"⚠️ Skipping EDA report: {len(df):,} rows exceeds the profiling limit of {max_rows:,}")
+        return
+    
+    # Imported lazily: ydata-profiling is slow to import and only needed here
+    from ydata_profiling import ProfileReport
+
+    profile = ProfileReport(df, title=title, minimal=minimal, explorative=explorative)
     profile.to_file(output_file)
     print(f"EDA report saved as '{output_file}'")
 
-def calculate_false_positive_rates(df: pd.DataFrame) -> None:
-    """Calculate false positive rates by different dimensions."""
+def encode_categoricals(df: pd.DataFrame, columns: tuple[str, ...] = CATEGORICAL_COLUMNS) -> pd.DataFrame:
+    """Return df with its object-dtype grouping columns converted to the pandas 'category' dtype.
+    
+    Groupbys on categoricals hash small integer codes instead of Python strings.
+    Callers must pass observed=True when grouping on these columns. The input
+    frame is left untouched: converted columns are set on a shallow copy, and
+    df itself is returned when nothing needs converting (e.g. after load_data).
+    
+    Args:
+        df: The pandas DataFrame to convert
+        columns: The columns to convert when present with object dtype
+    
+    Returns:
+        A DataFrame sharing df's unconverted columns
+    """
+    to_convert = [col for col in columns if col in df.columns and df[col].dtype == object]
+    if not to_convert:
+        return df
+    encoded = df.copy(deep=False)
+    for col in to_convert:
+        encoded[col] = df[col].astype('category')
+    return encoded
+
+def prepare_outcome_masks(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Build int8 false/true positive masks from the alert_outcome column.
+    
+    Computing these once lets every report share a single pass over
+    alert_outcome instead of re-scanning it for each metric. The masks are
+    derived from categorical codes, so the labels are only hashed once.
+    
+    Args:
+        df: The pandas DataFrame containing an 'alert_outcome' column
+    
+    Returns:
+        A (is_fp, is_tp) tuple of int8 arrays aligned with the rows of df
+    """
+    outcome = df['alert_outcome']
+    if not isinstance(outcome.dtype, pd.CategoricalDtype):
+        outcome = outcome.astype('category')
+    
+    # Compare the small integer codes rather than the label strings
+    codes = outcome.cat.codes.to_numpy()
+    fp_code, tp_code = outcome.cat.categories.get_indexer(['false_positive', 'true_positive'])
+    # get_indexer returns -1 for absent labels, which is also the code for missing values
+    is_fp = (codes == fp_code).view(np.int8) if fp_code >= 0 else np.zeros(len(codes), dtype=np.int8)
+    is_tp = (codes == tp_code).view(np.int8) if tp_code >= 0 else np.zeros(len(codes), dtype=np.int8)
+    return is_fp, is_tp
+
+def _fpr_table(fp_series: pd.Series, keys: pd.Series) -> pd.DataFrame:
+    """Aggregate a false positive mask into an (fp, total, fpr) table for one dimension."""
+    # int8 sums are downcast back to int8 when every group fits; keep counts int64
+    table = fp_series.groupby(keys, observed=True, sort=False).agg(fp='sum', total='size').astype(np.int64)
+    table['fpr'] = table['fp'] / table['total']
+    return table
+
+def map_dimensions(func: Callable[[pd.Series], Any], df: pd.DataFrame,
+                   columns: tuple[str, ...]) -> dict[str, Any]:
+    """Apply func to each available grouping column of df, one thread per column.
+    
+    The per-column results are independent. Work that releases the GIL, such as
+    pandas' groupby aggregations, overlaps across the threads; anything else
+    simply runs one column after another.
+    
+    Args:
+        func: Called with the column as a Series
+        df: The pandas DataFrame holding the grouping columns
+        columns: Grouping columns; those missing from df are skipped
+    
+    Returns:
+        A dict mapping each available column to func's result, in the order of columns
+    """
+    columns = [col for col in columns if col in df.columns]
+    if not columns:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(columns)) as pool:
+        futures = {col: pool.submit(func, df[col]) for col in columns}
+        return {col: future.result() for col, future in futures.items()}
+
+def compute_fpr_tables(df: pd.DataFrame, masks: tuple[np.ndarray, np.ndarray] | None = None) -> dict[str, pd.DataFrame]:
+    """Compute false positive counts and rates for every FPR dimension present in df.
+    
+    The result is shared by calculate_false_positive_rates and generate_fpr_report
+    so the grouped aggregation runs once per dimension rather than once per report.
+    
+    Args:
+        df: The pandas DataFrame to analyze
+        masks: Optional (is_fp, is_tp) tuple from prepare_outcome_masks
+    
+    Returns:
+        A dict mapping each dimension column to a DataFrame indexed by group
+        with 'fp', 'total' and 'fpr' columns
+    """
+    df = encode_categoricals(df)
+    is_fp, _ = masks if masks is not None else prepare_outcome_masks(df)
+    fp_series = pd.Series(is_fp, index=df.index)
+    
+    return map_dimensions(partial(_fpr_table, fp_series), df, FPR_DIMENSIONS)
+
+def _outcome_totals(is_fp: np.ndarray, is_tp: np.ndarray) -> dict[str, int]:
+    """Overall alert, false positive and true positive counts from the outcome masks."""
+    return {'total': len(is_fp), 'fp': int(np.count_nonzero(is_fp)), 'tp': int(np.count_nonzero(is_tp))}
+
+def stream_fpr_summary(file_path: str, chunksize: int = 2_000_000) -> tuple[dict[str, int], dict[str, pd.DataFrame]] | None:
+    """Compute the inputs of the text FPR reports by streaming a CSV in chunks.
+    
+    Only the outcome and dimension columns are parsed, and only one chunk is
+    resident at a time, so inputs larger than memory can be summarised.
+    
+    Args:
+        file_path: Path to the CSV file
+        chunksize: Number of rows parsed per chunk
+    
+    Returns:
+        A (totals, tables) tuple for the totals= and tables= arguments of
+        calculate_false_positive_rates and generate_fpr_report, or None if
+        the file has no 'alert_outcome' column
+    """
+    wanted = ('alert_outcome',) + FPR_DIMENSIONS
+    reader = pd.read_csv(file_path, chunksize=chunksize, usecols=lambda col: col in wanted,
+                         dtype={col: 'category' for col in wanted})
+    
+    totals = {'total': 0, 'fp': 0, 'tp': 0}
+    partial_counts = {col: [] for col in FPR_DIMENSIONS}
+    for chunk in reader:
+        if 'alert_outcome' not in chunk.columns:
+            print("Cannot stream FPR summary: Missing 'alert_outcome' column")
+            return None
+        is_fp, is_tp = prepare_outcome_masks(chunk)
+        for key, count in _outcome_totals(is_fp, is_tp).items():
+            totals[key] += count
+        fp_series = pd.Series(is_fp, index=chunk.index)
+        for col in FPR_DIMENSIONS:
+            if col in chunk.columns:
+                partial_counts[col].append(_fpr_table(fp_series, chunk[col])[['fp', 'total']])
+    
+    # Merge the per-chunk counts; rates are only derived once the totals are final
+    tables = {}
+    for col, parts in partial_counts.items():
+        if parts:
+            table = pd.concat(parts).groupby(level=0, observed=True, sort=False).sum()
+            table['fpr'] = table['fp'] / table['total']
+            tables[col] = table
+    return totals, tables
+
+def _fpr_report_inputs(df: pd.DataFrame | None, masks: tuple[np.ndarray, np.ndarray] | None,
+                       tables: dict[str, pd.DataFrame] | None,
+                       totals: dict[str, int] | None) -> tuple[dict[str, int], dict[str, pd.DataFrame]]:
+    """Fill in whichever of totals and tables were not precomputed, from df and its outcome masks."""
+    if totals is not None and tables is not None:
+        return totals, tables
+    df = encode_categoricals(df)
+    is_fp, is_tp = masks if masks is not None else prepare_outcome_masks(df)
+    if tables is None:
+        tables = compute_fpr_tables(df, (is_fp, is_tp))
+    if totals is None:
+        totals = _outcome_totals(is_fp, is_tp)
+    return totals, tables
+
+def calculate_false_positive_rates(df: pd.DataFrame | None, masks: tuple[np.ndarray, np.ndarray] | None = None,
+                                   tables: dict[str, pd.DataFrame] | None = None,
+                                   totals: dict[str, int] | None = None) -> None:
+    """Calculate false positive rates by different dimensions.
+    
+    Args:
+        df: The pandas DataFrame to analyze; may be None when both tables and totals are given
+        masks: Optional (is_fp, is_tp) tuple from prepare_outcome_masks
+        tables: Optional per-dimension tables from compute_fpr_tables
+        totals: Optional overall counts, as returned by stream_fpr_summary
+    """
     
     # Check if alert_outcome column exists (this contains true_positive/false_positive)
-    if 'alert_outcome' not in df.columns:
+    if (tables is None or totals is None) and 'alert_outcome' not in df.columns:
         print("No 'alert_outcome' column found. Cannot calculate false positive rate.")
         return
     
+    totals, tables = _fpr_report_inputs(df, masks, tables, totals)
+    
     # Calculate overall FPR using alert_outcome
-    total_alerts = len(df)
-    false_positives = (df['alert_outcome'] == 'false_positive').sum()
-    true_positives = (df['alert_outcome'] == 'true_positive').sum()
+    total_alerts = totals['total']
+    false_positives = totals['fp']
+    true_positives = totals['tp']
     
     # FPR = False Positives / Total Alerts
     overall_fpr = false_positives / total_alerts if total_alerts > 0 else 0
@@ -42,57 +317,58 @@ def calculate_false_positive_rates(df: pd.DataFrame) -> None:
     print(f"False Positive Rate: {overall_fpr:.3f} ({overall_fpr*100:.1f}%)")
     
     # FPR by alert_type
-    if 'alert_type' in df.columns:
-        fpr_by_type = df.groupby('alert_type')['alert_outcome'].apply(
-            lambda x: (x == 'false_positive').sum() / len(x) if len(x) > 0 else 0
-        ).sort_values(ascending=False)
+    if 'alert_type' in tables:
+        fpr_by_type = tables['alert_type']
         
         print("\nFPR by Alert Type:")
-        for alert_type, fpr in fpr_by_type.items():
-            count = ((df['alert_type'] == alert_type) & (df['alert_outcome'] == 'false_positive')).sum()
-            total = (df['alert_type'] == alert_type).sum()
-            print(f"  {alert_type}: {fpr:.3f} ({count}/{total})")
+        for row in fpr_by_type.sort_values('fpr', ascending=False).itertuples():
+            print(f"  {row.Index}: {row.fpr:.3f} ({row.fp}/{row.total})")
     
     # FPR by customer_risk_tier
-    if 'customer_risk_tier' in df.columns:
-        fpr_by_risk = df.groupby('customer_risk_tier')['alert_outcome'].apply(
-            lambda x: (x == 'false_positive').sum() / len(x) if len(x) > 0 else 0
-        ).sort_values(ascending=False)
+    if 'customer_risk_tier' in tables:
+        fpr_by_risk = tables['customer_risk_tier']
         
         print("\nFPR by Customer Risk Tier:")
-        for risk_tier, fpr in fpr_by_risk.items():
-            count = ((df['customer_risk_tier'] == risk_tier) & (df['alert_outcome'] == 'false_positive')).sum()
-            total = (df['customer_risk_tier'] == risk_tier).sum()
-            print(f"  {risk_tier}: {fpr:.3f} ({count}/{total})")
+        for row in fpr_by_risk.sort_values('fpr', ascending=False).itertuples():
+            print(f"  {row.Index}: {row.fpr:.3f} ({row.fp}/{row.total})")
     
     # FPR by country
-    if 'country' in df.columns:
-        fpr_by_country = df.groupby('country')['alert_outcome'].apply(
-            lambda x: (x == 'false_positive').sum() / len(x) if len(x) > 0 else 0
-        ).sort_values(ascending=False)
+    if 'country' in tables:
+        fpr_by_country = tables['country']
         
         # Show top 10 countries by FPR
-        top_countries = fpr_by_country.head(10)
+        top_countries = fpr_by_country.sort_values('fpr', ascending=False).head(10)
         
         print("\nFPR by Country (Top 10):")
-        for country, fpr in top_countries.items():
-            count = ((df['country'] == country) & (df['alert_outcome'] == 'false_positive')).sum()
-            total = (df['country'] == country).sum()
-            print(f"  {country}: {fpr:.3f} ({count}/{total})")
+        for row in top_countries.itertuples():
+            print(f"  {row.Index}: {row.fpr:.3f} ({row.fp}/{row.total})")
     
     print("=" * 50)
 
-def generate_fpr_report(df: pd.DataFrame, output_file: str = "false_positive_analysis_report.txt") -> None:
-    """Generate a comprehensive false positive rate analysis report."""
+def generate_fpr_report(df: pd.DataFrame | None, output_file: str = "false_positive_analysis_report.txt",
+                        masks: tuple[np.ndarray, np.ndarray] | None = None,
+                        tables: dict[str, pd.DataFrame] | None = None,
+                        totals: dict[str, int] | None = None) -> None:
+    """Generate a comprehensive false positive rate analysis report.
+    
+    Args:
+        df: The pandas DataFrame to analyze; may be None when both tables and totals are given
+        output_file: The filename to save the report to
+        masks: Optional (is_fp, is_tp) tuple from prepare_outcome_masks
+        tables: Optional per-dimension tables from compute_fpr_tables
+        totals: Optional overall counts, as returned by stream_fpr_summary
+    """
     
-    if 'alert_outcome' not in df.columns:
+    if (tables is None or totals is None) and 'alert_outcome' not in df.columns:
         print("Cannot generate FPR report: Missing 'alert_outcome' column")
         return
     
+    totals, tables = _fpr_report_inputs(df, masks, tables, totals)
+    
     # Calculate metrics
-    total_alerts = len(df)
-    false_positives = (df['alert_outcome'] == 'false_positive').sum()
-    true_positives = (df['alert_outcome'] == 'true_positive').sum()
+    total_alerts = totals['total']
+    false_positives = totals['fp']
+    true_positives = totals['tp']
     overall_fpr = false_positives / total_alerts if total_alerts > 0 else 0
     
     # Generate report content
@@ -112,7 +388,7 @@ DETAILED ANALYSIS
 -----------------
 
 1. OVERALL PERFORMANCE
-   - Dataset Size: {len(df):,} alerts
+   - Dataset Size: {total_alerts:,} alerts
    - False Positive Rate: {overall_fpr*100:.1f}%
    - True Positive Rate: {(true_positives/total_alerts)*100:.1f}%
    - Alert Effectiveness: {((true_positives/total_alerts)*100):.1f}% of alerts are valid
@@ -120,40 +396,28 @@ DETAILED ANALYSIS
 """
 
     # Add breakdown by alert_type if available
-    if 'alert_type' in df.columns:
+    if 'alert_type' in tables:
         report_content += "2. FALSE POSITIVE RATE BY ALERT TYPE\n"
-        fpr_by_type = df.groupby('alert_type')['alert_outcome'].apply(
-            lambda x: (x == 'false_positive').sum() / len(x) if len(x) > 0 else 0
-        )
-        for alert_type, fpr in fpr_by_type.items():
-            fp_count = ((df['alert_type'] == alert_type) & (df['alert_outcome'] == 'false_positive')).sum()
-            total_count = (df['alert_type'] == alert_type).sum()
-            report_content += f"   - {alert_type}: {fpr:.3f} ({fpr*100:.1f}%) - {fp_count:,}/{total_count:,} alerts\n"
+        fpr_by_type = tables['alert_type']
+        for row in fpr_by_type.sort_index().itertuples():
+            report_content += f"   - {row.Index}: {row.fpr:.3f} ({row.fpr*100:.1f}%) - {row.fp:,}/{row.total:,} alerts\n"
         report_content += "\n"
 
     # Add breakdown by customer_risk_tier if available
-    if 'customer_risk_tier' in df.columns:
+    if 'customer_risk_tier' in tables:
         report_content += "3. FALSE POSITIVE RATE BY CUSTOMER RISK TIER\n"
-        fpr_by_risk = df.groupby('customer_risk_tier')['alert_outcome'].apply(
-            lambda x: (x == 'false_positive').sum() / len(x) if len(x) > 0 else 0
-        )
-        for risk_tier, fpr in fpr_by_risk.items():
-            fp_count = ((df['customer_risk_tier'] == risk_tier) & (df['alert_outcome'] == 'false_positive')).sum()
-            total_count = (df['customer_risk_tier'] == risk_tier).sum()
-            report_content += f"   - {risk_tier}: {fpr:.3f} ({fpr*100:.1f}%) - {fp_count:,}/{total_count:,} alerts\n"
+        fpr_by_risk = tables['customer_risk_tier']
+        for row in fpr_by_risk.sort_index().itertuples():
+            report_content += f"   - {row.Index}: {row.fpr:.3f} ({row.fpr*100:.1f}%) - {row.fp:,}/{row.total:,} alerts\n"
         report_content += "\n"
 
     # Add breakdown by country if available
-    if 'country' in df.columns:
+    if 'country' in tables:
         report_content += "4. FALSE POSITIVE RATE BY COUNTRY (TOP 10)\n"
-        fpr_by_country = df.groupby('country')['alert_outcome'].apply(
-            lambda x: (x == 'false_positive').sum() / len(x) if len(x) > 0 else 0
-        ).sort_values(ascending=False)
+        fpr_by_country = tables['country']
         
-        for country, fpr in fpr_by_country.head(10).items():
-            fp_count = ((df['country'] == country) & (df['alert_outcome'] == 'false_positive')).sum()
-            total_count = (df['country'] == country).sum()
-            report_content += f"   - {country}: {fpr:.3f} ({fpr*100:.1f}%) - {fp_count:,}/{total_count:,} alerts\n"
+        for row in fpr_by_country.sort_values('fpr', ascending=False).head(10).itertuples():
+            report_content += f"   - {row.Index}: {row.fpr:.3f} ({row.fpr*100:.1f}%) - {row.fp:,}/{row.total:,} alerts\n"
         report_content += "\n"
 
     # Add recommendations
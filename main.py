@@ -1,36 +1,72 @@
-import pandas as pd
+import multiprocessing
+import sys
+
 import yaml
 
-from helper.function import load_data, generate_eda_report, calculate_false_positive_rates, generate_fpr_report
+from helper.function import load_data, generate_eda_report, calculate_false_positive_rates, generate_fpr_report, prepare_outcome_masks, compute_fpr_tables, stream_fpr_summary
 from generate_plotly_report import create_interactive_report
 
-if __name__=="__main__":
-    ## REad config
-    with open("config.yaml", 'r') as file:
-        config = yaml.safe_load(file)
+def run_streaming_analysis(config: dict) -> None:
+    """Write only the text FPR reports, computed chunk by chunk without loading the full data."""
+    print("\n" + "="*60)
+    print("GENERATING FALSE POSITIVE RATE ANALYSIS (STREAMING)...")
+    print("="*60)
+    summary = stream_fpr_summary(config["INPUT_DATA_PATH"])
+    if summary is not None:
+        totals, fpr_tables = summary
+        calculate_false_positive_rates(None, tables=fpr_tables, totals=totals)
+        generate_fpr_report(None, "false_positive_analysis_report.txt", tables=fpr_tables, totals=totals)
+    print("Skipping the EDA and interactive reports: they need the full data in memory")
 
+def run_full_analysis(config: dict) -> None:
+    """Load the full data and write the EDA, FPR and interactive reports."""
     ## Load data
-    df = pd.read_csv(config["INPUT_DATA_PATH"])
+    df = load_data(config["INPUT_DATA_PATH"])
 
     ## Print data shape and statistics
     print("Data Shape:", df.shape)
     print("Data Statistics:\n", df.describe())
     print("Data Head:\n", df.head())
 
+    ## Initial data exploration
+    ## Using ydata-profiling for EDA, in a separate process so it overlaps the analysis below
+    generate_profile = config.get("GENERATE_PROFILE", False)
+    if generate_profile:
+        profile_process = multiprocessing.Process(
+            target=generate_eda_report,
+            args=(df, "Transaction Monitoring Data Report", "EDA_report.html")
+        )
+        profile_process.start()
+
     ## False Positive Rate Analysis
     print("\n" + "="*60)
     print("GENERATING FALSE POSITIVE RATE ANALYSIS...")
     print("="*60)
-    calculate_false_positive_rates(df)
-    generate_fpr_report(df, "false_positive_analysis_report.txt")
+    masks = prepare_outcome_masks(df)
+    fpr_tables = compute_fpr_tables(df, masks)
+    calculate_false_positive_rates(df, masks, fpr_tables)
+    generate_fpr_report(df, "false_positive_analysis_report.txt", masks, fpr_tables)
 
     ## Interactive Plotly Report
     print("\n" + "="*60)
     print("GENERATING INTERACTIVE PLOTLY REPORT...")
     print("="*60)
-    create_interactive_report(df, "transaction_monitoring_analysis.html")
+    create_interactive_report(df, "transaction_monitoring_analysis.html", masks, tables=fpr_tables)
 
-    ## Initial data exploration
-    ## Using ydata-profiling for EDA
-    generate_eda_report(df, "Transaction Monitoring Data Report", "EDA_report.html")
-    
\ No newline at end of file
+    ## Wait for the EDA report to finish
+    if generate_profile:
+        profile_process.join()
+        if profile_process.exitcode != 0:
+            print(f"⚠️ EDA report generation failed (exit code {profile_process.exitcode})")
+            sys.exit(1)
+
+if __name__=="__main__":
+    ## REad config
+    with open("config.yaml", 'r') as file:
+        config = yaml.safe_load(file)
+
+    ## Streaming mode skips loading the full data, for inputs larger than memory
+    if config.get("STREAM_FPR_ANALYSIS", False):
+        run_streaming_analysis(config)
+    else:
+        run_full_analysis(config)